@@ -0,0 +1,309 @@
+import os
+import sys
+import json
+import time
+import base64
+import random
+import sqlite3
+import argparse
+import tempfile
+import numpy as np
+import datetime as dt
+
+import Reports_Generic as reports
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+GOLDEN_DIR = os.path.join(HERE, 'golden_outputs')
+SAMPLE_DB = os.path.join(HERE, 'generic_evd_database.db')
+
+# Synthetic evidence: name -> (seed, files, max folder depth, children per folder)
+SYNTHETIC_DBS = {
+    'synthetic_nested': (1, 2000, 5, 6),
+    'synthetic_wide': (2, 3000, 1, 1),
+}
+
+EXTENSIONS = [
+    ('.pdf', 'application/pdf', 'Portable Document Format', 'Page Layout'),
+    ('.doc', 'application/msword', 'Microsoft Word Document', 'Word Processor'),
+    ('.xls', 'application/vnd.ms-excel', 'Microsoft Excel Spreadsheet', 'Spreadsheet'),
+    ('.jpg', 'image/jpeg', 'JPEG File Interchange Format', 'Image'),
+    ('.txt', 'text/plain', 'Plain Text File', 'Text'),
+    ('', 'application/octet-stream', 'Unknown Binary', 'Unknown'),
+]
+
+# Reports for one evidence DB. Every mode returns the same (First Contact, Directory Tree) HTML pair,
+# optimized engines are added to MODES next to 'reference' and checked against it.
+def reference_fcr(db_file):
+    dir_tree_df, details_df, ritm_num, files_df, folders_df, summary_df = reports.sql_query(db_file)
+    totals_tbl = reports.generate_totals_table(summary_df)
+    graph_html = reports.generate_graphs(files_df)
+    return reports.generate_html_fcr(graph_html, details_df, totals_tbl)
+
+def reference_dirtree(db_file):
+    dir_tree_df, details_df, ritm_num, files_df, folders_df, summary_df = reports.sql_query(db_file)
+    totals_tbl = reports.generate_totals_table(summary_df)
+    return reports.generate_html_dirtree(
+        dir_tree_df['Path'].tolist(),
+        dir_tree_df['Type'].tolist(),
+        dir_tree_df['Size'].tolist(),
+        reports.bytes_to_kb(dir_tree_df['Size']).tolist(),
+        reports.bytes_to_mb(dir_tree_df['Size']).tolist(),
+        reports.bytes_to_gb(dir_tree_df['Size']).tolist(),
+        details_df,
+        totals_tbl
+    )
+
+MODES = {
+    'reference': (reference_fcr, reference_dirtree),
+}
+
+def make_synthetic_db(path, seed, file_count, max_depth, fan_out):
+    # Same schema as the sample DB, filled from a seeded generator so the golden snapshot stays valid
+    sample = sqlite3.connect(SAMPLE_DB)
+    schema = [row[0] for row in sample.execute(
+        "SELECT sql FROM sqlite_master WHERE type = 'table' AND name IN ('files', 'folders', 'summary', 'details')"
+    )]
+    sample.close()
+
+    rng = random.Random(seed)
+    root = f'\\\\#SYN#\\evidence{seed}'
+    folders = [root]
+    for _ in range(file_count // 20):
+        parent = rng.choice(folders)
+        if parent.count('\\') - root.count('\\') < max_depth:
+            folders.append(f'{parent}\\dir{len(folders) % fan_out}_{len(folders)}')
+
+    files = []
+    for i in range(file_count):
+        ext, file_type, file_format, file_class = rng.choice(EXTENSIONS)
+        size = rng.choice([0, rng.randint(1, 1024 ** 2), rng.randint(1024 ** 2, 10 * 1024 ** 2), rng.randint(10 * 1024 ** 2, 200 * 1024 ** 2)])
+        created = dt.datetime(2001, 1, 1) + dt.timedelta(seconds=rng.randint(0, 20 * 365 * 86400))
+        modified = created + dt.timedelta(seconds=rng.randint(0, 86400 * 30))
+        name = f'file{i:06d}{ext}'
+        files.append((
+            name, f'{rng.choice(folders)}\\{name}', size, size / 1024 ** 3, ext, file_type, file_format, file_class,
+            f'{rng.randint(0, file_count // 2):040x}', created.strftime('%Y-%m-%d %H:%M:%S'), modified.strftime('%Y-%m-%d %H:%M:%S')
+        ))
+    total_bytes = sum(file[2] for file in files)
+
+    conn = sqlite3.connect(path)
+    for statement in schema:
+        conn.execute(statement)
+    conn.executemany("""
+        INSERT INTO files (FileName, FullPath, FileSizeBytes, FileSizeGB, FileExtension, FileType, FileFormat, Class, FileHash, FileCreationDate, FileLastModified)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    """, files)
+    # Every generated folder is listed, including the ones no file landed in
+    conn.executemany(
+        'INSERT INTO folders (FolderName, FullPath, FolderSizeBytes, FolderSizeGB, FolderFileCount) VALUES (?, ?, ?, ?, ?)',
+        [(folder.rsplit('\\', 1)[-1], folder, 0, 0.0, 0) for folder in folders]
+    )
+    conn.execute(
+        'INSERT INTO summary (JobID, SourcePath, DestinationPath, TotalFiles, TotalSizeBytes, TotalSizeGB) VALUES (?, ?, ?, ?, ?, ?)',
+        (f'synthetic{seed}', root, root, file_count, total_bytes, total_bytes / 1024 ** 3)
+    )
+    conn.execute(
+        'INSERT INTO details (ClientName, MatterName, CustodianName, ProjectManager, EvidenceId, Date) VALUES (?, ?, ?, ?, ?, ?)',
+        ('Synthetic Client', 'Synthetic Matter', f'Custodian {seed}', 'Project Manager', f'SYN{seed:07d}', '01/01/2024')
+    )
+    conn.commit()
+    conn.close()
+
+def canonical_value(value):
+    # Plotly writes numpy arrays as base64 typed arrays, decode them so both encodings compare equal
+    if isinstance(value, dict) and 'bdata' in value:
+        array = np.frombuffer(base64.b64decode(value['bdata']), dtype=np.dtype(value['dtype']))
+        if 'shape' in value:
+            array = array.reshape([int(dim) for dim in str(value['shape']).split(',')])
+        value = array.tolist()
+    if isinstance(value, dict):
+        return {key: canonical_value(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [canonical_value(item) for item in value]
+    if isinstance(value, float):
+        if value != value:
+            return 'NaN'
+        if value.is_integer():
+            return int(value)
+        return float(f'{value:.10g}')  # Summation order can move the last few digits
+    return value
+
+def canonical_trace(trace):
+    kind = trace.get('type', 'scatter')
+    if kind == 'table':
+        return {
+            'type': kind,
+            'header': canonical_value(trace['header']['values']),
+            'cells': canonical_value(trace['cells']['values']),
+        }
+    if kind in ('treemap', 'sunburst'):
+        # Node ids are arbitrary, nodes are identified by their label path instead
+        labels = dict(zip(trace['ids'], trace['labels']))
+        parents = dict(zip(trace['ids'], trace['parents']))
+        def label_path(node_id):
+            path = []
+            while node_id:
+                path.append(labels[node_id])
+                node_id = parents[node_id]
+            return '\\'.join(reversed(path))
+        values = canonical_value(trace['values'])
+        return {'type': kind, 'nodes': sorted([label_path(node_id), value] for node_id, value in zip(trace['ids'], values))}
+    if kind == 'pie':
+        return {'type': kind, 'slices': sorted(zip(canonical_value(trace['labels']), canonical_value(trace['values'])))}
+    # Bars are compared as category -> value so ties in value_counts may come back in any order
+    return {
+        'type': kind,
+        'name': trace.get('name', ''),
+        'bars': sorted(zip(canonical_value(trace['x']), canonical_value(trace['y'])), key=lambda bar: str(bar[0])),
+    }
+
+def extract_figures(html):
+    decoder = json.JSONDecoder()
+    figures = []
+    start = html.find('Plotly.newPlot(')
+    while start != -1:
+        pos = start + len('Plotly.newPlot(')
+        arguments = []
+        for _ in range(3):  # Div id, data, layout
+            while html[pos] in ' \t\r\n,':
+                pos += 1
+            argument, pos = decoder.raw_decode(html, pos)
+            arguments.append(argument)
+        _, data, layout = arguments
+        figures.append({
+            'title': layout.get('title', {}).get('text', ''),
+            'traces': [canonical_trace(trace) for trace in data],
+        })
+        start = html.find('Plotly.newPlot(', pos)
+    return figures
+
+def extract_tree(html):
+    start = html.index('var TREE = ') + len('var TREE = ')
+    packed, _ = json.JSONDecoder().raw_decode(html, start)
+    names, types, sizes, parents, ends = packed['n'], packed['t'], packed['s'], packed['p'], packed['e']
+    count = len(names)
+
+    # The page relies on these to draw and search, so a broken packing is an error and not a diff
+    if sorted(packed['o']) != list(range(count)):
+        raise ValueError('Search order is not a permutation of the tree nodes')
+    for i in range(count):
+        if not (parents[i] < i and i < ends[i] <= count) or (types[i] == 0 and ends[i] != i + 1):
+            raise ValueError(f'Packed tree node {i} ({names[i]}) has an inconsistent parent or subtree end')
+
+    paths = []
+    nodes = []
+    for i in range(count):
+        paths.append(names[i] if parents[i] < 0 else f'{paths[parents[i]]}\\{names[i]}')
+        nodes.append([paths[i], 'folder' if types[i] == 1 else 'file', canonical_value(sizes[i])])
+    return sorted(nodes)
+
+def snapshot_reports(fcr_html, dirtree_html):
+    return {
+        'fcr': {'figures': extract_figures(fcr_html)},
+        'dirtree': {'figures': extract_figures(dirtree_html), 'tree': extract_tree(dirtree_html)},
+    }
+
+def first_difference(expected, actual, where='$'):
+    if type(expected) != type(actual):
+        return f'{where}: expected {type(expected).__name__} {expected!r:.80}, got {type(actual).__name__} {actual!r:.80}'
+    if isinstance(expected, dict):
+        for key in sorted(set(expected) | set(actual)):
+            if key not in actual or key not in expected:
+                return f'{where}.{key}: only in {"golden" if key in expected else "output"}'
+            difference = first_difference(expected[key], actual[key], f'{where}.{key}')
+            if difference:
+                return difference
+        return None
+    if isinstance(expected, list):
+        for i, (expected_item, actual_item) in enumerate(zip(expected, actual)):
+            difference = first_difference(expected_item, actual_item, f'{where}[{i}]')
+            if difference:
+                return difference
+        if len(expected) != len(actual):
+            return f'{where}: expected {len(expected)} items, got {len(actual)}'
+        return None
+    if expected != actual:
+        return f'{where}: expected {expected!r:.80}, got {actual!r:.80}'
+    return None
+
+def run_mode(mode, db_file):
+    fcr_fn, dirtree_fn = MODES[mode]
+    start = time.perf_counter()
+    fcr_html = fcr_fn(db_file)
+    fcr_time = time.perf_counter() - start
+    start = time.perf_counter()
+    dirtree_html = dirtree_fn(db_file)
+    dirtree_time = time.perf_counter() - start
+    return snapshot_reports(fcr_html, dirtree_html), fcr_time, dirtree_time
+
+def main():
+    # Initializing the Argument Parser
+    parser = argparse.ArgumentParser(description='Checks that every report engine reproduces the golden First Contact and Directory Tree content')
+
+    # Add command-line arguments
+    parser.add_argument('-m', '--modes', type=str, nargs='+', required=False, default=list(MODES), choices=list(MODES), help='Report engines to run')
+    parser.add_argument('-db', '--database', type=str, nargs='+', required=False, default=[], help='Extra .db files, compared against the reference engine only')
+    parser.add_argument('-u', '--update', action='store_true', help='Rewrite the golden snapshots from the reference engine')
+
+    # Parse the arguments
+    args = parser.parse_args()
+    modes = args.modes
+    if 'reference' not in modes:
+        modes = ['reference'] + modes
+
+    failures = 0
+    with tempfile.TemporaryDirectory() as work_dir:
+        databases = [('generic_evd_database', SAMPLE_DB, True)]
+        for name, (seed, file_count, max_depth, fan_out) in SYNTHETIC_DBS.items():
+            db_file = os.path.join(work_dir, f'{name}.db')
+            make_synthetic_db(db_file, seed, file_count, max_depth, fan_out)
+            databases.append((name, db_file, True))
+        for db_file in args.database:
+            databases.append((os.path.splitext(os.path.basename(db_file))[0], db_file, False))
+
+        print(f'\n{"Database":<28}{"Mode":<14}{"FCR (s)":>10}{"DirTree (s)":>13}{"Speedup":>9}  Result')
+        for name, db_file, has_golden in databases:
+            golden_path = os.path.join(GOLDEN_DIR, f'{name}.json')
+            golden = None
+            if has_golden and not args.update and os.path.exists(golden_path):
+                with open(golden_path) as f:
+                    golden = json.load(f)
+
+            reference = None
+            for mode in modes:
+                snapshot, fcr_time, dirtree_time = run_mode(mode, db_file)
+                # Round tripping through JSON so tuples and lists compare alike
+                snapshot = json.loads(json.dumps(snapshot))
+                if mode == 'reference':
+                    reference = (snapshot, fcr_time + dirtree_time)
+                    if has_golden and args.update:
+                        os.makedirs(GOLDEN_DIR, exist_ok=True)
+                        with open(golden_path, 'w') as f:
+                            json.dump(snapshot, f, indent=1, sort_keys=True)
+
+                # Every mode is checked against the golden snapshot, and every other mode also against
+                # the reference output from this run so a stale snapshot cannot hide an engine mismatch
+                results = []
+                mismatch = False
+                if golden is not None:
+                    difference = first_difference(golden, snapshot)
+                    mismatch = mismatch or difference is not None
+                    results.append(f'golden mismatch {difference}' if difference else 'matches golden')
+                elif args.update and has_golden and mode == 'reference':
+                    results.append('golden written')
+                elif mode == 'reference':
+                    results.append('no golden' if has_golden else 'reference only')
+                if mode != 'reference':
+                    difference = first_difference(reference[0], snapshot)
+                    mismatch = mismatch or difference is not None
+                    results.append(f'reference mismatch {difference}' if difference else 'matches reference')
+                failures += 1 if mismatch else 0
+
+                speedup = reference[1] / (fcr_time + dirtree_time)
+                print(f'{name:<28}{mode:<14}{fcr_time:>10.2f}{dirtree_time:>13.2f}{speedup:>8.2f}x  {"; ".join(results)}')
+
+    if failures:
+        print(f'\n{failures} report(s) differ')
+        sys.exit(1)
+
+if __name__ == "__main__": main()
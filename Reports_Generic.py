@@ -1,5 +1,9 @@
 import os
+import json
 import sqlite3
+import heapq
+import tempfile
+from urllib.request import pathname2url
 import argparse
 import numpy as np
 import pandas as pd
@@ -18,6 +22,13 @@ def bytes_to_mb(bytes): return (bytes / (1024 ** 2))    # Bytes to MBs
 def bytes_to_gb(bytes): return (bytes / (1024 ** 3))    # Bytes to GBs
 def bytes_to_tb(bytes): return bytes / (1024 ** 4)      # Bytes to TBs
 
+def positive_int(value):
+    # argparse type for counts that have to be at least 1
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError(f'{value} is not a whole number of 1 or more')
+    return number
+
 def sql_query(path):
     conn = sqlite3.connect(path) # This is for testing purposes
 
@@ -39,6 +50,191 @@ def sql_query(path):
     
     return dir_tree_df, details_df, ritm_num, files_df, folders_df, summary_df
 
+def check_evidence_dbs(paths):
+    # Every DB is checked read-only before anything else connects to it, sqlite3.connect and ATTACH would
+    # create a missing file, and a DB without its summary or details row would silently drop out of the
+    # comparison and zero every 'common to all' figure
+    seen = set()
+    job_ids = []
+    for path in paths:
+        if not os.path.isfile(path):
+            raise FileNotFoundError(f'Evidence database not found: {path}')
+        real_path = os.path.normcase(os.path.realpath(path))
+        if real_path in seen:
+            raise ValueError(f'{path} is given more than once, every evidence item would share all of its files')
+        seen.add(real_path)
+
+        conn = sqlite3.connect(f'file:{pathname2url(os.path.abspath(path))}?mode=ro', uri=True)
+        try:
+            tables = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+            missing = {'files', 'summary', 'details'} - tables
+            if missing:
+                raise ValueError(f'{path} is not an evidence database, missing table(s): {", ".join(sorted(missing))}')
+            for table in ('summary', 'details'):
+                if conn.execute(f'SELECT COUNT(*) FROM {table}').fetchone()[0] == 0:
+                    raise ValueError(f'{path} has no row in its {table} table')
+            job_ids.append(conn.execute('SELECT JobID FROM summary LIMIT 1').fetchone()[0])
+        finally:
+            conn.close()
+
+    # The comparison is for evidence items of one job, its report is filed under that JobID
+    if len(set(job_ids)) > 1:
+        mixed = ', '.join(f'{path} ({job_id})' for path, job_id in zip(paths, job_ids))
+        raise ValueError(f'Evidence databases belong to different JobIDs: {mixed}')
+
+    return job_ids[0]
+
+def compare_query(paths, work_dir):
+    check_evidence_dbs(paths)
+
+    # The set operations run in an on-disk scratch database. Each evidence DB is attached in turn and
+    # reduced to tables keyed by FileHash and by relative path, so every join below walks two sorted
+    # indexes side by side instead of holding the files tables in memory.
+    conn = sqlite3.connect(os.path.join(work_dir, 'comparison.db'))
+    try:
+        conn.executescript("""
+            PRAGMA journal_mode = OFF;
+            PRAGMA synchronous = OFF;
+            PRAGMA temp_store = FILE;
+            PRAGMA cache_size = -262144;
+            CREATE TABLE evidence (
+                Evidence INTEGER PRIMARY KEY, JobID TEXT, EvidenceId TEXT, CustodianName TEXT, ClientName TEXT,
+                MatterName TEXT, ProjectManager TEXT, Date TEXT, Files INTEGER, Bytes INTEGER
+            );
+            CREATE TABLE hashes (Hash TEXT, Evidence INTEGER, Files INTEGER, Bytes INTEGER, PRIMARY KEY (Hash, Evidence)) WITHOUT ROWID;
+            CREATE TABLE paths (Path TEXT, Evidence INTEGER, Hash TEXT, Bytes INTEGER, PRIMARY KEY (Path, Evidence)) WITHOUT ROWID;
+        """)
+
+        for evidence, path in enumerate(paths):
+            conn.execute('ATTACH DATABASE ? AS evd', (path,))
+            conn.execute("""
+                INSERT INTO evidence
+                SELECT ?, s.JobID, d.EvidenceId, d.CustodianName, d.ClientName, d.MatterName, d.ProjectManager, d.Date,
+                    f.Files, f.Bytes
+                FROM (SELECT JobID FROM evd.summary LIMIT 1) s,
+                    (SELECT * FROM evd.details LIMIT 1) d,
+                    (SELECT COUNT(*) AS Files, COALESCE(SUM(FileSizeBytes), 0) AS Bytes FROM evd.files) f
+            """, (evidence,))
+            conn.execute("""
+                INSERT INTO hashes
+                SELECT FileHash, ?, COUNT(*), COALESCE(SUM(FileSizeBytes), 0) FROM evd.files
+                WHERE FileHash <> ''
+                GROUP BY FileHash
+                ORDER BY FileHash
+            """, (evidence,))
+            # Paths are compared relative to each evidence's SourcePath, case-insensitively like Windows
+            conn.execute("""
+                INSERT OR IGNORE INTO paths
+                SELECT ltrim(lower(CASE WHEN lower(substr(f.FullPath, 1, length(s.SourcePath))) = lower(s.SourcePath)
+                            THEN substr(f.FullPath, length(s.SourcePath) + 1) ELSE f.FullPath END), '\\'),
+                    ?, NULLIF(f.FileHash, ''), COALESCE(f.FileSizeBytes, 0)
+                FROM evd.files f, (SELECT SourcePath FROM evd.summary LIMIT 1) s
+                ORDER BY 1
+            """, (evidence,))
+            conn.commit()
+            conn.execute('DETACH DATABASE evd')
+
+        # How many evidence items and custodians each hash / path appears in. A file without a hash counts
+        # as its own version of the path, the same as the 'x.Hash IS NOT y.Hash' test in the pairwise table
+        conn.executescript("""
+            CREATE TABLE custodian_hashes (Hash TEXT, Custodian TEXT, Evidences INTEGER, Files INTEGER, Bytes INTEGER, PRIMARY KEY (Hash, Custodian)) WITHOUT ROWID;
+            INSERT INTO custodian_hashes
+            SELECT h.Hash, COALESCE(e.CustodianName, ''), COUNT(*), SUM(h.Files), SUM(h.Bytes)
+            FROM hashes h JOIN evidence e ON e.Evidence = h.Evidence
+            GROUP BY h.Hash, COALESCE(e.CustodianName, '');
+            CREATE TABLE hash_seen (Hash TEXT PRIMARY KEY, Seen INTEGER, Custodians INTEGER) WITHOUT ROWID;
+            INSERT INTO hash_seen SELECT Hash, SUM(Evidences), COUNT(*) FROM custodian_hashes GROUP BY Hash;
+            CREATE TABLE path_seen (Path TEXT PRIMARY KEY, Seen INTEGER, Versions INTEGER) WITHOUT ROWID;
+            INSERT INTO path_seen SELECT Path, COUNT(*), COUNT(DISTINCT COALESCE(Hash, '')) FROM paths GROUP BY Path;
+        """)
+
+        evidence_df = pd.read_sql_query("""
+            SELECT e.*,
+                COALESCE(u.HashedFiles, 0) AS HashedFiles,
+                COALESCE(u.HashedBytes, 0) AS HashedBytes,
+                COALESCE(u.DistinctHashes, 0) AS DistinctHashes,
+                COALESCE(u.UniqueFiles, 0) AS UniqueFiles,
+                COALESCE(u.UniqueBytes, 0) AS UniqueBytes,
+                COALESCE(u.CommonFiles, 0) AS CommonFiles,
+                COALESCE(u.CommonBytes, 0) AS CommonBytes,
+                COALESCE(p.UniquePaths, 0) AS UniquePaths,
+                COALESCE(p.ChangedPaths, 0) AS ChangedPaths
+            FROM evidence e
+            LEFT JOIN (
+                SELECT h.Evidence, SUM(h.Files) AS HashedFiles, SUM(h.Bytes) AS HashedBytes, COUNT(*) AS DistinctHashes,
+                    SUM(CASE WHEN s.Seen = 1 THEN h.Files ELSE 0 END) AS UniqueFiles,
+                    SUM(CASE WHEN s.Seen = 1 THEN h.Bytes ELSE 0 END) AS UniqueBytes,
+                    SUM(CASE WHEN s.Seen = :items THEN h.Files ELSE 0 END) AS CommonFiles,
+                    SUM(CASE WHEN s.Seen = :items THEN h.Bytes ELSE 0 END) AS CommonBytes
+                FROM hashes h JOIN hash_seen s ON s.Hash = h.Hash
+                GROUP BY h.Evidence
+            ) u ON u.Evidence = e.Evidence
+            LEFT JOIN (
+                SELECT p.Evidence, SUM(s.Seen = 1) AS UniquePaths, SUM(s.Versions > 1) AS ChangedPaths
+                FROM paths p JOIN path_seen s ON s.Path = p.Path
+                GROUP BY p.Evidence
+            ) p ON p.Evidence = e.Evidence
+            ORDER BY e.Evidence
+        """, conn, params={'items': len(paths)})
+
+        # Unique here means no other custodian has the hash, evidence items of the same custodian are pooled
+        custodian_df = pd.read_sql_query("""
+            SELECT e.Custodian AS CustodianName, e.EvidenceItems, e.EvidenceIds,
+                COALESCE(u.HashedFiles, 0) AS HashedFiles,
+                COALESCE(u.HashedBytes, 0) AS HashedBytes,
+                COALESCE(u.UniqueFiles, 0) AS UniqueFiles,
+                COALESCE(u.UniqueBytes, 0) AS UniqueBytes
+            FROM (
+                SELECT COALESCE(CustodianName, '') AS Custodian, MIN(Evidence) AS FirstEvidence,
+                    COUNT(*) AS EvidenceItems, group_concat(EvidenceId, ', ') AS EvidenceIds
+                FROM evidence
+                GROUP BY COALESCE(CustodianName, '')
+            ) e
+            LEFT JOIN (
+                SELECT c.Custodian, SUM(c.Files) AS HashedFiles, SUM(c.Bytes) AS HashedBytes,
+                    SUM(CASE WHEN s.Custodians = 1 THEN c.Files ELSE 0 END) AS UniqueFiles,
+                    SUM(CASE WHEN s.Custodians = 1 THEN c.Bytes ELSE 0 END) AS UniqueBytes
+                FROM custodian_hashes c JOIN hash_seen s ON s.Hash = c.Hash
+                GROUP BY c.Custodian
+            ) u ON u.Custodian = e.Custodian
+            ORDER BY e.FirstEvidence
+        """, conn)
+
+        pairs_df = pd.read_sql_query("""
+            SELECT a.Evidence AS EvidenceA, b.Evidence AS EvidenceB,
+                COALESCE(h.SharedHashes, 0) AS SharedHashes,
+                COALESCE(h.SharedFilesA, 0) AS SharedFilesA, COALESCE(h.SharedBytesA, 0) AS SharedBytesA,
+                COALESCE(h.SharedFilesB, 0) AS SharedFilesB, COALESCE(h.SharedBytesB, 0) AS SharedBytesB,
+                COALESCE(p.SharedPaths, 0) AS SharedPaths, COALESCE(p.ChangedPaths, 0) AS ChangedPaths
+            FROM evidence a JOIN evidence b ON b.Evidence > a.Evidence
+            LEFT JOIN (
+                SELECT x.Evidence AS EvidenceA, y.Evidence AS EvidenceB, COUNT(*) AS SharedHashes,
+                    SUM(x.Files) AS SharedFilesA, SUM(x.Bytes) AS SharedBytesA,
+                    SUM(y.Files) AS SharedFilesB, SUM(y.Bytes) AS SharedBytesB
+                FROM hashes x JOIN hashes y ON y.Hash = x.Hash AND y.Evidence > x.Evidence
+                GROUP BY x.Evidence, y.Evidence
+            ) h ON h.EvidenceA = a.Evidence AND h.EvidenceB = b.Evidence
+            LEFT JOIN (
+                SELECT x.Evidence AS EvidenceA, y.Evidence AS EvidenceB, COUNT(*) AS SharedPaths,
+                    SUM(x.Hash IS NOT y.Hash) AS ChangedPaths
+                FROM paths x JOIN paths y ON y.Path = x.Path AND y.Evidence > x.Evidence
+                GROUP BY x.Evidence, y.Evidence
+            ) p ON p.EvidenceA = a.Evidence AND p.EvidenceB = b.Evidence
+            ORDER BY a.Evidence, b.Evidence
+        """, conn)
+
+        common_df = pd.read_sql_query("""
+            SELECT
+                (SELECT COUNT(*) FROM hash_seen WHERE Seen = :items) AS CommonHashes,
+                (SELECT COUNT(*) FROM path_seen WHERE Seen = :items) AS CommonPaths
+        """, conn, params={'items': len(paths)})
+        common_df['CommonFiles'] = evidence_df.loc[0, 'CommonFiles']     # Files common to all, counted in the first evidence item
+        common_df['CommonBytes'] = evidence_df.loc[0, 'CommonBytes']
+    finally:
+        conn.close()
+
+    return evidence_df, custodian_df, pairs_df, common_df
+
 def generate_graphs(files_df):
     # Cleaning the data
     files_df['FileLastModified'] = pd.to_datetime(files_df['FileLastModified'])
@@ -281,41 +477,34 @@ def build_tree_dict(paths, types, sizes_bytes, sizes_kb, sizes_mb, sizes_gb):
             current = current[part]['children']
     return tree
 
-def build_html_tree(tree, path=""):
-    html = ""
-    for name, data in tree.items():
-        item_type = data['type']
-        subtree = data['children']
-        size_bytes = data['size_bytes']
-        size_kb = data['size_kb']
-        size_mb = data['size_mb']
-        size_gb = data['size_gb']
-
-        size_display = f'''
-            <span class="size size-bytes">&emsp;<b>{size_bytes} bytes</b></span>
-            <span class="size size-kb" style="display: none;">&emsp;<b>{size_kb:.6f} KB</b></span>
-            <span class="size size-mb" style="display: none;">&emsp;<b>{size_mb:.6f} MB</b></span>
-            <span class="size size-gb" style="display: none;">&emsp;<b>{size_gb:.6f} GB</b></span>
-        '''
-
-        if item_type == 'folder':  # It's a folder
-            folder_id = f"folder_{path.replace('/', '_')}_{name}"
-            if subtree:  # Check if it has items inside
-                html += f"""
-                <li>
-                    <span class="folder" onclick="toggleFolder('{folder_id}')">{name} {size_display}</span>
-                    <ul class="nested" id="{folder_id}">
-                        {build_html_tree(subtree, f"{path}/{name}")}
-                    </ul>
-                </li>
-                """
-        else:  # It's a file
-            html += f"""
-            <li>
-                <span class="file-icon"></span> {name} {size_display}
-            </li>
-            """
-    return html
+def build_packed_tree(tree):
+    # Flattening the tree into pre-order columns the DirTree page can draw lazily:
+    # names, type (1 folder, 0 file), size in bytes, parent index and subtree end index
+    packed = {'n': [], 't': [], 's': [], 'p': [], 'e': []}
+
+    def pack(subtree, parent):
+        for name, data in subtree.items():
+            is_folder = data['type'] == 'folder'
+            if is_folder and not data['children']:  # Empty folders are not listed
+                continue
+            index = len(packed['n'])
+            packed['n'].append(name)
+            packed['t'].append(1 if is_folder else 0)
+            packed['s'].append(data['size_bytes'])
+            packed['p'].append(parent)
+            packed['e'].append(0)
+            if is_folder:
+                pack(data['children'], index)
+            packed['e'][index] = len(packed['n'])  # First index after this node's subtree
+
+    pack(tree, -1)
+
+    # Search index, node indexes ordered by lowercase name for the page's binary prefix search. UTF-16
+    # code units sort the same way JavaScript compares strings.
+    packed['o'] = sorted(range(len(packed['n'])), key=lambda i: packed['n'][i].lower().encode('utf-16-be'))
+
+    # Keeping '</script>' inside a name from closing the script block
+    return json.dumps(packed, separators=(',', ':')).replace('</', '<\\/')
 
 def propagate_sizes(tree):
     total_size = 0
@@ -332,6 +521,130 @@ def propagate_sizes(tree):
 
     return total_size
 
+def build_treemap(tree, top_k=20, max_nodes=5000):
+    # Largest folders are opened first; each keeps its top_k children and the rest
+    # are collapsed into one 'other' node, until max_nodes nodes have been placed
+    ids, labels, parents, values = [], [], [], []
+
+    def add_node(label, parent, value):
+        ids.append(str(len(ids)))
+        labels.append(label)
+        parents.append(parent)
+        values.append(value)
+        return ids[-1]
+
+    # Evidence paths start with a chain of single folders (server, share, ...), each chain is shown as one
+    # root so the first view already splits where the tree branches. The root keeps the top folder's size.
+    top_level = {}
+    for name, data in tree.items():
+        size = data['size_bytes']
+        while data['type'] == 'folder' and len(data['children']) == 1:
+            child_name, child = next(iter(data['children'].items()))
+            if child['type'] != 'folder' or not child['children']:
+                break
+            name, data = f'{name}\\{child_name}', child
+        top_level[name] = dict(data, size_bytes=size)
+
+    # Top level entries follow the same top_k rule and also count against max_nodes
+    queue = []
+    roots = heapq.nlargest(top_k, top_level.items(), key=lambda item: item[1]['size_bytes'])
+    if len(roots) + (1 if len(top_level) > len(roots) else 0) > max_nodes:
+        roots = roots[:max_nodes - 1]  # Leaving room for the 'other' node
+    for name, data in roots:
+        node_id = add_node(name, '', data['size_bytes'])
+        if data['type'] == 'folder' and data['children']:
+            heapq.heappush(queue, (-data['size_bytes'], node_id, data['children']))
+    if len(top_level) > len(roots):
+        rest_size = sum(data['size_bytes'] for data in top_level.values()) - sum(data['size_bytes'] for _, data in roots)
+        add_node(f'other ({len(top_level) - len(roots)} items)', '', rest_size)
+
+    while queue and len(ids) < max_nodes:
+        _, node_id, children = heapq.heappop(queue)
+        kept = heapq.nlargest(top_k, children.items(), key=lambda item: item[1]['size_bytes'])
+        rest = len(children) - len(kept)
+        if len(ids) + len(kept) + (1 if rest else 0) > max_nodes:  # Folder stays a single block
+            continue
+        for name, data in kept:
+            child_id = add_node(name, node_id, data['size_bytes'])
+            if data['type'] == 'folder' and data['children']:
+                heapq.heappush(queue, (-data['size_bytes'], child_id, data['children']))
+        if rest:
+            rest_size = sum(data['size_bytes'] for data in children.values()) - sum(data['size_bytes'] for _, data in kept)
+            add_node(f'other ({rest} items)', node_id, rest_size)
+
+    treemap = go.Figure(
+        go.Treemap(
+            ids=ids,
+            labels=labels,
+            parents=parents,
+            values=values,
+            branchvalues='total',
+            maxdepth=3,
+            hovertemplate='<b>%{label}</b><br>%{value:,} bytes<br>%{percentParent:.2%} of parent<extra></extra>'
+        )).update_layout(
+            font_family = 'Montserrat, sans-serif',
+            title_text = '<b>Disk Usage by Folder</b>',
+            margin = dict(b=10, l=10, r=10, t=50),
+            height = 600,
+            treemapcolorway = [ID_BLUE, ID_RED, ID_GREY],
+            sunburstcolorway = [ID_BLUE, ID_RED, ID_GREY],
+            title=dict(
+                font_color='black',
+                font_size=20,
+                x=0.95,
+                y=0.96,
+                xanchor='right'
+            ),
+            updatemenus=[dict(
+                type='buttons',
+                direction='right',
+                x=0,
+                y=1.08,
+                xanchor='left',
+                buttons=[
+                    dict(label='Treemap', method='restyle', args=[{'type': 'treemap'}]),
+                    dict(label='Sunburst', method='restyle', args=[{'type': 'sunburst'}])
+                ]
+            )],
+            template='ggplot2'
+        ).to_html(
+            full_html=False,
+            include_plotlyjs='cdn',
+            config={
+                'displaylogo':False,
+                'modeBarButtonsToRemove': ['toImage', 'lasso2d']
+            }
+        )
+
+    return treemap
+
+def generate_totals_table(summary_df):
+    totalfiles = summary_df.loc[0, 'TotalFiles']
+    totalgbs = np.round(summary_df.loc[0, 'TotalSizeGB'], 4)
+
+    return generate_summary_table(['<b>Total Files</b>', '<b>Size (GB)</b>'], [totalfiles, totalgbs])
+
+def generate_summary_table(headers, values, width=300):
+    # One row table shown in the totals bar under each report header
+    totals_tbl = go.Figure(data=[go.Table(
+        header=dict(values=headers),
+        cells = dict(  
+            values=values, height=25
+            ))]
+        ).update_layout(
+            margin=dict(b=0, l=10, r=10,t=10), template='ggplot2',
+            width=width
+    ).to_html(
+            full_html=False,
+            include_plotlyjs='cdn',
+            config={
+                'displaylogo':False,
+                'modeBarButtonsToRemove': ['toImage', 'lasso2d']
+            }
+    )
+
+    return totals_tbl
+
 def generate_html_fcr(graph_html, details_df, totals_tbl):
     html_code = f"""
 <!DOCTYPE html>
@@ -467,18 +780,36 @@ def generate_html_fcr(graph_html, details_df, totals_tbl):
     """
     return html_code
 
-def generate_html_dirtree(paths, types, sizes_bytes, sizes_kb, sizes_mb, sizes_gb, details_df, totals_tbl):
+def generate_html_dirtree(paths, types, sizes_bytes, sizes_kb, sizes_mb, sizes_gb, details_df, totals_tbl, treemap_top_k=20, treemap_nodes=5000):
     tree = build_tree_dict(paths, types, sizes_bytes, sizes_kb, sizes_mb, sizes_gb)
     propagate_sizes(tree)
-    html_structure = build_html_tree(tree)
+    treemap = build_treemap(tree, treemap_top_k, treemap_nodes)
+    packed_tree = build_packed_tree(tree)
 
     html_code = f"""
 <!DOCTYPE html>
 <html>
     <head>
         <style type="text/css" media="screen">
-            ul, #dirTree {{
-                list-style-type: none;
+            #dirTree {{
+                position: relative;
+                height: 70vh;
+                overflow-y: auto;
+                border: 1px solid #cccccc;
+            }}
+            #dirTreeRows {{
+                position: relative;
+            }}
+            .tree-row {{
+                position: absolute;
+                left: 0;
+                right: 0;
+                height: 22px;
+                line-height: 22px;
+                white-space: nowrap;
+            }}
+            .selected {{
+                background-color: #dde4ee;
             }}
             body {{
                 font-family: 'Calibri', san-serif;
@@ -497,11 +828,15 @@ def generate_html_dirtree(paths, types, sizes_bytes, sizes_kb, sizes_mb, sizes_g
                 display: inline-block;
                 margin-right: 5px;
             }}
-            .nested {{
-                display: none;
+            #searchResults {{
+                max-height: 20vh;
+                overflow-y: auto;
+                list-style-type: none;
+                padding-left: 10px;
             }}
-            .active {{
-                display: block;
+            #searchResults li {{
+                cursor: pointer;
+                white-space: nowrap;
             }}
             .file-icon::before {{
                 content: "\\1F4C4";
@@ -542,41 +877,6 @@ def generate_html_dirtree(paths, types, sizes_bytes, sizes_kb, sizes_mb, sizes_g
                 height: 75px;
             }}
         </style>
-        <script>
-            function toggleFolder(id) {{
-            var element = document.getElementById(id);
-            var caret = element.previousElementSibling;
-            element.classList.toggle("active");
-            caret.classList.toggle("folder-open");
-            }}
-            function toggleSizeFormat(format) {{
-            var bytes = document.querySelectorAll('.size-bytes');
-            var kbs = document.querySelectorAll('.size-kb');
-            var mbs = document.querySelectorAll('.size-mb');
-            var gbs = document.querySelectorAll('.size-gb');
-            if (format === 'bytes') {{
-                bytes.forEach(el => el.style.display = '');
-                kbs.forEach(el => el.style.display = 'none');
-                mbs.forEach(el => el.style.display = 'none');
-                gbs.forEach(el => el.style.display = 'none');
-            }} else if (format === 'kbs') {{
-                bytes.forEach(el => el.style.display = 'none');
-                kbs.forEach(el => el.style.display = '');
-                mbs.forEach(el => el.style.display = 'none');
-                gbs.forEach(el => el.style.display = 'none');
-            }} else if (format === 'mbs') {{
-                bytes.forEach(el => el.style.display = 'none');
-                kbs.forEach(el => el.style.display = 'none');
-                mbs.forEach(el => el.style.display = '');
-                gbs.forEach(el => el.style.display = 'none');
-            }} else {{
-                bytes.forEach(el => el.style.display = 'none');
-                kbs.forEach(el => el.style.display = 'none');
-                mbs.forEach(el => el.style.display = 'none');
-                gbs.forEach(el => el.style.display = '');
-            }}
-            }}
-        </script>
     </head>
     <body>
         <hr style="background-color:#96131d; height:10px;">
@@ -620,6 +920,9 @@ def generate_html_dirtree(paths, types, sizes_bytes, sizes_kb, sizes_mb, sizes_g
         <div class="totals">
             {totals_tbl}
         </div>
+        <div class="treemap">
+            {treemap}
+        </div>
         <div>
             <h2>File Directory Navigator</h2>
             <h3>Size Type
@@ -630,23 +933,552 @@ def generate_html_dirtree(paths, types, sizes_bytes, sizes_kb, sizes_mb, sizes_g
                     <option value="gbs">GB</option>
                 </select>
             </h3>
-            <ul id="dirTree">
-                {html_structure}
-            </ul>
+            <h3>Search
+                <input id="searchBox" type="search" placeholder="File or folder name" oninput="scheduleSearch(this.value)">
+                <span id="searchStatus"></span>
+            </h3>
+            <ul id="searchResults"></ul>
+            <div id="dirTree">
+                <div id="dirTreeRows"></div>
+            </div>
         </div>
+        <script>
+            // Kept inside a function so the navigator's variables stay off window
+            (function () {{
+            var TREE = {packed_tree};
+            var ROW_HEIGHT = 22;
+            var OVERSCAN = 20;
+            var MAX_SPACER_HEIGHT = 1000000;  // Well under the element height browsers can scroll
+            var SEARCH_LIMIT = 200;
+
+            var count = TREE.n.length;
+            var depth = new Int32Array(count);
+            var expanded = new Uint8Array(count);
+            var rows = new Int32Array(count);
+            var rowCount = 0;
+            var scrollScale = 1;
+            var sizeFormat = 'bytes';
+            var selected = -1;
+            var viewport = document.getElementById('dirTree');
+            var spacer = document.getElementById('dirTreeRows');
+
+            // Parents always come before their children in the packed order
+            for (var i = 0; i < count; i++) {{
+                depth[i] = TREE.p[i] < 0 ? 0 : depth[TREE.p[i]] + 1;
+            }}
+
+            // Substring index, built the first time a search gets past the prefix matches
+            var haystack = null;
+            var offsets = null;
+
+            function formatSize(bytes) {{
+            if (sizeFormat === 'kbs') return (bytes / 1024).toFixed(6) + ' KB';
+            if (sizeFormat === 'mbs') return (bytes / 1048576).toFixed(6) + ' MB';
+            if (sizeFormat === 'gbs') return (bytes / 1073741824).toFixed(6) + ' GB';
+            return bytes + ' bytes';
+            }}
+            function buildRows() {{
+            // Only open folders are walked, closed ones jump straight past their subtree
+            var n = 0;
+            var node = 0;
+            while (node < count) {{
+                rows[n++] = node;
+                node = (TREE.t[node] === 1 && !expanded[node]) ? TREE.e[node] : node + 1;
+            }}
+            rowCount = n;
+
+            // Past MAX_SPACER_HEIGHT the scrollbar stands for the full list height scaled down, so every row stays reachable
+            var spacerHeight = Math.min(rowCount * ROW_HEIGHT, MAX_SPACER_HEIGHT);
+            var overflow = rowCount * ROW_HEIGHT - viewport.clientHeight;
+            var room = spacerHeight - viewport.clientHeight;
+            scrollScale = (overflow > 0 && room > 0) ? overflow / room : 1;
+            spacer.style.height = spacerHeight + 'px';
+            drawRows();
+            }}
+            function drawRows() {{
+            // Offset into the full list, rows are placed relative to it around the current scroll position
+            var offset = viewport.scrollTop * scrollScale;
+            var first = Math.max(0, Math.floor(offset / ROW_HEIGHT) - OVERSCAN);
+            var last = Math.min(rowCount, Math.ceil((offset + viewport.clientHeight) / ROW_HEIGHT) + OVERSCAN);
+            var fragment = document.createDocumentFragment();
+            for (var r = first; r < last; r++) {{
+                var node = rows[r];
+                var row = document.createElement('div');
+                var label = document.createElement('span');
+                var size = document.createElement('b');
+                row.className = node === selected ? 'tree-row selected' : 'tree-row';
+                row.style.top = (viewport.scrollTop + r * ROW_HEIGHT - offset) + 'px';
+                row.style.paddingLeft = (depth[node] * 20) + 'px';
+                if (TREE.t[node] === 1) {{
+                    label.className = expanded[node] ? 'folder folder-open' : 'folder';
+                    label.dataset.node = node;
+                }} else {{
+                    row.appendChild(document.createElement('span')).className = 'file-icon';
+                }}
+                label.appendChild(document.createTextNode(TREE.n[node] + '\\u2003'));
+                size.textContent = formatSize(TREE.s[node]);
+                label.appendChild(size);
+                row.appendChild(label);
+                fragment.appendChild(row);
+            }}
+            spacer.textContent = '';
+            spacer.appendChild(fragment);
+            }}
+            function toggleFolder(node) {{
+            expanded[node] = expanded[node] ? 0 : 1;
+            buildRows();
+            }}
+            function toggleSizeFormat(format) {{
+            sizeFormat = format;
+            drawRows();
+            }}
+            function fullPath(node) {{
+            var names = [];
+            for (; node >= 0; node = TREE.p[node]) names.push(TREE.n[node]);
+            return names.reverse().join('\\\\');
+            }}
+            function revealNode(node) {{
+            for (var parent = TREE.p[node]; parent >= 0; parent = TREE.p[parent]) expanded[parent] = 1;
+            selected = node;
+            buildRows();
+            for (var r = 0; r < rowCount; r++) {{
+                if (rows[r] === node) {{
+                    viewport.scrollTop = Math.max(0, r * ROW_HEIGHT - viewport.clientHeight / 2) / scrollScale;
+                    break;
+                }}
+            }}
+            drawRows();
+            }}
+            function sortedName(rank) {{
+            return TREE.n[TREE.o[rank]].toLowerCase();
+            }}
+            function lowerBound(query) {{
+            // First sorted position whose name is not below the query
+            var low = 0;
+            var high = count;
+            while (low < high) {{
+                var mid = (low + high) >> 1;
+                if (sortedName(mid) < query) low = mid + 1; else high = mid;
+            }}
+            return low;
+            }}
+            function buildHaystack() {{
+            // Every lowercase name in sorted order, each one preceded by a newline
+            var parts = new Array(count);
+            var position = 1;
+            offsets = new Int32Array(count);
+            for (var k = 0; k < count; k++) {{
+                parts[k] = sortedName(k);
+                offsets[k] = position;
+                position += parts[k].length + 1;
+            }}
+            haystack = '\\n' + parts.join('\\n') + '\\n';
+            }}
+            function rankAt(pos) {{
+            // Sorted position of the name that contains haystack offset pos
+            var low = 0;
+            var high = count - 1;
+            while (low < high) {{
+                var mid = (low + high + 1) >> 1;
+                if (offsets[mid] <= pos) low = mid; else high = mid - 1;
+            }}
+            return low;
+            }}
+            function searchTree(query) {{
+            var results = document.getElementById('searchResults');
+            var status = document.getElementById('searchStatus');
+            results.textContent = '';
+            status.textContent = '';
+            query = query.toLowerCase();
+            if (!query || count === 0) return;
+
+            // Names starting with the query are one contiguous run of the sorted order
+            var ranks = [];
+            var prefixStart = lowerBound(query);
+            var prefixEnd = prefixStart;
+            while (prefixEnd < count && ranks.length < SEARCH_LIMIT && sortedName(prefixEnd).startsWith(query)) {{
+                ranks.push(prefixEnd++);
+            }}
+
+            // Then names containing it elsewhere
+            if (ranks.length < SEARCH_LIMIT) {{
+                if (haystack === null) buildHaystack();
+                var pos = haystack.indexOf(query);
+                while (pos !== -1 && ranks.length < SEARCH_LIMIT) {{
+                    var rank = rankAt(pos);
+                    if (rank < prefixStart || rank >= prefixEnd) ranks.push(rank);
+                    // Skipping the rest of this name
+                    pos = haystack.indexOf(query, rank + 1 < count ? offsets[rank + 1] : haystack.length);
+                }}
+            }}
+
+            var fragment = document.createDocumentFragment();
+            ranks.forEach(function (rank) {{
+                var node = TREE.o[rank];
+                var item = document.createElement('li');
+                item.className = TREE.t[node] === 1 ? 'folder' : 'file-icon';
+                item.textContent = fullPath(node);
+                item.onclick = function () {{ revealNode(node); }};
+                fragment.appendChild(item);
+            }});
+            results.appendChild(fragment);
+            status.textContent = ranks.length >= SEARCH_LIMIT ? 'Showing the first ' + SEARCH_LIMIT + ' matches' : ranks.length + ' matches';
+            }}
+            var searchTimer = null;
+            function scheduleSearch(query) {{
+            clearTimeout(searchTimer);
+            searchTimer = setTimeout(function () {{ searchTree(query); }}, 150);
+            }}
+
+            var drawPending = false;
+            viewport.addEventListener('scroll', function () {{
+            if (drawPending) return;
+            drawPending = true;
+            requestAnimationFrame(function () {{
+                drawPending = false;
+                drawRows();
+            }});
+            }});
+            spacer.addEventListener('click', function (event) {{
+            var folder = event.target.closest('.folder');
+            if (folder) toggleFolder(Number(folder.dataset.node));
+            }});
+            buildRows();
+
+            // Used by the inline handlers on the size dropdown and search box
+            window.toggleSizeFormat = toggleSizeFormat;
+            window.scheduleSearch = scheduleSearch;
+            }})();
+        </script>
     </body>
 </html>
 """
     return html_code
 
+def generate_comparison_graphs(evidence_df, custodian_df, pairs_df):
+    # Labels and the derived per-evidence columns
+    evidence_df['Label'] = evidence_df['EvidenceId'].astype(str) + ' (' + evidence_df['CustodianName'].astype(str) + ')'
+    evidence_df['SizeGB'] = np.round(bytes_to_gb(evidence_df['Bytes']), 4)
+    evidence_df['UniqueGB'] = np.round(bytes_to_gb(evidence_df['UniqueBytes']), 4)
+    evidence_df['SharedGB'] = np.round(bytes_to_gb(evidence_df['HashedBytes'] - evidence_df['UniqueBytes']), 4)
+    evidence_df['SharedFiles'] = evidence_df['HashedFiles'] - evidence_df['UniqueFiles']
+    evidence_df['DeltaGB'] = np.round(bytes_to_gb(evidence_df['Bytes'] - evidence_df.loc[0, 'Bytes']), 4)
+
+    # Pairwise set differences, A is always the earlier evidence item
+    labels = evidence_df.set_index('Evidence')['Label']
+    hashed_files = evidence_df.set_index('Evidence')['HashedFiles']
+    hashed_bytes = evidence_df.set_index('Evidence')['HashedBytes']
+    total_bytes = evidence_df.set_index('Evidence')['Bytes']
+    pairs_df['LabelA'] = pairs_df['EvidenceA'].map(labels)
+    pairs_df['LabelB'] = pairs_df['EvidenceB'].map(labels)
+    pairs_df['OnlyAFiles'] = pairs_df['EvidenceA'].map(hashed_files) - pairs_df['SharedFilesA']
+    pairs_df['OnlyAGB'] = np.round(bytes_to_gb(pairs_df['EvidenceA'].map(hashed_bytes) - pairs_df['SharedBytesA']), 4)
+    pairs_df['OnlyBFiles'] = pairs_df['EvidenceB'].map(hashed_files) - pairs_df['SharedFilesB']
+    pairs_df['OnlyBGB'] = np.round(bytes_to_gb(pairs_df['EvidenceB'].map(hashed_bytes) - pairs_df['SharedBytesB']), 4)
+    pairs_df['DeltaGB'] = np.round(bytes_to_gb(pairs_df['EvidenceB'].map(total_bytes) - pairs_df['EvidenceA'].map(total_bytes)), 4)
+
+    overlap_bar = go.Figure(
+        data=[
+            go.Bar(name='Shared', x=evidence_df['Label'], y=evidence_df['SharedGB'], marker_color=ID_BLUE,
+                   hovertemplate='%{y:.4f} GBs of %{x} found in other evidence<extra></extra>'),
+            go.Bar(name='Unique', x=evidence_df['Label'], y=evidence_df['UniqueGB'], marker_color=ID_RED,
+                   hovertemplate='%{y:.4f} GBs only in %{x}<extra></extra>')
+        ]).update_layout(
+            barmode = 'stack',
+            font_family = 'Montserrat, sans-serif',
+            title_text = '<b>Shared and Unique Size (GB) by Evidence</b>',
+            xaxis_title = '',
+            yaxis_title = '',
+            yaxis = dict(tickformat = ','),
+            margin = dict(b=10, l=10, r=10, t=50),
+            legend=dict(
+                orientation='h',
+                xanchor='center',
+                yanchor='top',
+                x=0.5,
+                y=-0.1,
+                font_size=12
+            ),
+            title=dict(
+                font_color='black',
+                font_size=20,
+                x=0.95,
+                y=0.96,
+                xanchor='right'
+            ),
+            template='ggplot2'
+        ).update_yaxes(
+            showgrid = True
+        ).to_html(
+            full_html=False,
+            include_plotlyjs='cdn',
+            config={
+                'displaylogo':False,
+                'modeBarButtonsToRemove': ['toImage', 'lasso2d']
+            }
+        )
+
+    evidence_tbl = go.Figure(
+        data=go.Table(
+            header=dict(values=[
+                '<b>Evidence</b>', '<b>Files</b>', '<b>Size (GB)</b>', '<b>Distinct Hashes</b>',
+                '<b>Unique Files</b>', '<b>Unique (GB)</b>', '<b>Shared Files</b>',
+                '<b>Unique Paths</b>', '<b>Changed Paths</b>', '<b>Size Delta (GB)</b>'
+            ]),
+            cells=dict(
+                values=[
+                    evidence_df['Label'], evidence_df['Files'], evidence_df['SizeGB'], evidence_df['DistinctHashes'],
+                    evidence_df['UniqueFiles'], evidence_df['UniqueGB'], evidence_df['SharedFiles'],
+                    evidence_df['UniquePaths'], evidence_df['ChangedPaths'], evidence_df['DeltaGB']
+                ],
+                height=25
+            )
+            )).update_layout(
+                title_text = '<b>Evidence Overlap by FileHash and Path</b>',
+                margin=dict(b=10, l=10, r=10, t=50),
+                autosize=True,
+                title=dict(
+                    font_color='black',
+                    font_size=20,
+                    x=0.95,
+                    y=0.96,
+                    xanchor='right'
+                ), template='ggplot2'
+        ).to_html(
+            full_html=False,
+            include_plotlyjs='cdn',
+            config={
+                'displaylogo':False,
+                'modeBarButtonsToRemove': ['toImage', 'lasso2d']
+            }
+        )
+
+    # Unique and shared files per custodian
+    custodian_df['UniqueGB'] = np.round(bytes_to_gb(custodian_df['UniqueBytes']), 4)
+    custodian_df['SharedFiles'] = custodian_df['HashedFiles'] - custodian_df['UniqueFiles']
+    custodian_df['SharedGB'] = np.round(bytes_to_gb(custodian_df['HashedBytes'] - custodian_df['UniqueBytes']), 4)
+
+    custodian_tbl = go.Figure(
+        data=go.Table(
+            header=dict(values=[
+                '<b>Custodian</b>', '<b>Evidence</b>', '<b>Hashed Files</b>',
+                '<b>Unique Files</b>', '<b>Unique (GB)</b>', '<b>Shared Files</b>', '<b>Shared (GB)</b>'
+            ]),
+            cells=dict(
+                values=[
+                    custodian_df['CustodianName'], custodian_df['EvidenceIds'], custodian_df['HashedFiles'],
+                    custodian_df['UniqueFiles'], custodian_df['UniqueGB'], custodian_df['SharedFiles'], custodian_df['SharedGB']
+                ],
+                height=25
+            )
+            )).update_layout(
+                title_text = '<b>Files Unique to Each Custodian by FileHash</b>',
+                margin=dict(b=10, l=10, r=10, t=50),
+                autosize=True,
+                title=dict(
+                    font_color='black',
+                    font_size=20,
+                    x=0.95,
+                    y=0.96,
+                    xanchor='right'
+                ), template='ggplot2'
+        ).to_html(
+            full_html=False,
+            include_plotlyjs='cdn',
+            config={
+                'displaylogo':False,
+                'modeBarButtonsToRemove': ['toImage', 'lasso2d']
+            }
+        )
+
+    pairs_tbl = go.Figure(
+        data=go.Table(
+            header=dict(values=[
+                '<b>Evidence A</b>', '<b>Evidence B</b>', '<b>Shared Hashes</b>',
+                '<b>Only in A (Files)</b>', '<b>Only in A (GB)</b>', '<b>Only in B (Files)</b>', '<b>Only in B (GB)</b>',
+                '<b>Shared Paths</b>', '<b>Changed Paths</b>', '<b>Size Delta B - A (GB)</b>'
+            ]),
+            cells=dict(
+                values=[
+                    pairs_df['LabelA'], pairs_df['LabelB'], pairs_df['SharedHashes'],
+                    pairs_df['OnlyAFiles'], pairs_df['OnlyAGB'], pairs_df['OnlyBFiles'], pairs_df['OnlyBGB'],
+                    pairs_df['SharedPaths'], pairs_df['ChangedPaths'], pairs_df['DeltaGB']
+                ],
+                height=25
+            )
+            )).update_layout(
+                title_text = '<b>Pairwise Comparison</b>',
+                margin=dict(b=10, l=10, r=10, t=50),
+                autosize=True,
+                title=dict(
+                    font_color='black',
+                    font_size=20,
+                    x=0.95,
+                    y=0.96,
+                    xanchor='right'
+                ), template='ggplot2'
+        ).to_html(
+            full_html=False,
+            include_plotlyjs='cdn',
+            config={
+                'displaylogo':False,
+                'modeBarButtonsToRemove': ['toImage', 'lasso2d']
+            }
+        )
+
+    html_graphs = overlap_bar, evidence_tbl, custodian_tbl, pairs_tbl
+
+    return html_graphs
+
+def generate_html_comparison(graph_html, evidence_df, totals_tbl):
+    evidence_ids = ', '.join(evidence_df['EvidenceId'].astype(str))
+    custodians = ', '.join(evidence_df['CustodianName'].astype(str).drop_duplicates())
+
+    html_code = f"""
+<!DOCTYPE html>
+<html>
+    <head>
+        <meta charset="UTF-8">
+        <meta name="viewport" content="width=device-width, initial-scale=1.0">
+        <style type="text/css" media="screen">
+            body {{
+                font-family: 'Calibri', san-serif;
+            }}
+            .descriptor {{
+                text-align: right;
+            }}
+            .table {{
+                height: 75px;
+                overflow: hidden;
+            }}
+            .floatLeft {{
+                display: inline-block;
+            }}
+            .totals{{
+                display: flex;
+                height: 75px;
+            }}
+            .plots{{
+                display: flex;
+                justify-content: center;
+                align-items: center;
+                flex-wrap: wrap;
+                margin: 0 auto;
+                margin-top: 10px;
+            }}
+            .graph1, .graph2, .graph3, .graph4 {{
+                margin: 0.5px;
+                box-sizing: border-box;
+                width: 90%;
+            }}
+        </style>
+        <script src="https://cdn.plot.ly/plotly-latest.min.js"></script>
+    </head>
+    <body>
+        <hr style="background-color:#96131d; height:10px;">
+        <div class="header">
+            <table class="table floatLeft">
+                <tbody>
+                    <tr>
+                        <td class="descriptor">
+                            <b>Client Name:</b> 
+                        </td>
+                        <td>{evidence_df.loc[0, 'ClientName']}</td>
+                        <td class="descriptor">
+                            <b>Date:</b> 
+                        </td>
+                        <td>{evidence_df.loc[0, 'Date']}</td>
+                    </tr>
+                    <tr>
+                        <td class="descriptor">
+                            <b>Matter Name:</b>
+                        </td>
+                        <td>{evidence_df.loc[0, 'MatterName']}</td>
+                        <td class="descriptor">
+                            <b>Evidence IDs:</b>
+                        </td>
+                        <td>{evidence_ids}</td>
+                    </tr>
+                    <tr>
+                        <td class="descriptor">
+                            <b>Custodian Names:</b>
+                        </td>
+                        <td>{custodians}</td>
+                        <td class="descriptor">
+                            <b>Project Manager:</b>
+                        </td>
+                        <td>{evidence_df.loc[0, 'ProjectManager']}</td>
+                    </tr>
+                </tbody>
+            </table>
+        </div>
+        <hr style="background-color:#96131d; height:10px;">
+        <div class="totals">
+            {totals_tbl}
+        </div>
+        <div class="plots">
+            <div class="graph1">
+                {graph_html[0]}
+            </div>
+            <div class="graph2">
+                {graph_html[1]}
+            </div>
+            <div class="graph3">
+                {graph_html[2]}
+            </div>
+            <div class="graph4">
+                {graph_html[3]}
+            </div>
+        </div>
+    </body>
+</html>
+    """
+    return html_code
+
+def generate_comparison_report(db_files, output):
+    date = dt.datetime.now().strftime('%Y%m%d-%H%M%S')
+    ritm_num = check_evidence_dbs(db_files)
+
+    output_ritm = os.path.join(output, 'Generic', 'Reports', f'{ritm_num}')
+    os.makedirs(output_ritm, exist_ok=True)
+    comparisonname = f'{ritm_num}_ComparisonReport_{date}.html'
+    comparison_html_path = os.path.join(output_ritm, comparisonname)
+
+    print(f'\nComparing {len(db_files)} evidence items')
+    # The scratch database sits next to the reports, it can grow to the size of the hash lists
+    with tempfile.TemporaryDirectory(dir=output_ritm) as work_dir:
+        evidence_df, custodian_df, pairs_df, common_df = compare_query(db_files, work_dir)
+
+    totals_tbl = generate_summary_table(
+        ['<b>Evidence Items</b>', '<b>Total Files</b>', '<b>Size (GB)</b>', '<b>Files Common to All</b>', '<b>Common (GB)</b>', '<b>Paths Common to All</b>'],
+        [
+            len(evidence_df), evidence_df['Files'].sum(), np.round(bytes_to_gb(evidence_df['Bytes'].sum()), 4),
+            common_df.loc[0, 'CommonFiles'], np.round(bytes_to_gb(common_df.loc[0, 'CommonBytes']), 4), common_df.loc[0, 'CommonPaths']
+        ],
+        width=900
+    )
+
+    print('Generating Comparison Report')
+    graph_html = generate_comparison_graphs(evidence_df, custodian_df, pairs_df)
+    comparison_html_output = generate_html_comparison(graph_html, evidence_df, totals_tbl)
+    print('Writing Comparison Report to HTML file.')
+
+    with open(comparison_html_path, "w") as f:
+        f.write(comparison_html_output)
+
+    print(f"\nComparison Report generated as: \n{comparisonname} \n\nReports generated here: \n{comparison_html_path}\n")
+
 def main():
     # Initializing the Argument Parser
-    parser = argparse.ArgumentParser(description='Generates a First Contact and Directory Tree Report')
+    parser = argparse.ArgumentParser(description='Generates a First Contact and Directory Tree Report, or a Comparison Report across evidence items')
 
     # Add command-line arguments
     parser.add_argument('-db', '--database', type=str, required=True, help='Path to .db file')
     parser.add_argument('-op', '--outpath', type=str, required=False, default=f'{os.environ["ProgramData"]}', help='Output path')
     parser.add_argument('-nodt', '--nodirectorytree', action='store_true', help='Exclude the Directory Tree Report')
+    parser.add_argument('-tk', '--treemaptopk', type=positive_int, required=False, default=20, help='Largest children kept per folder in the Disk Usage treemap')
+    parser.add_argument('-tn', '--treemapnodes', type=positive_int, required=False, default=5000, help='Maximum number of nodes in the Disk Usage treemap')
+    parser.add_argument('-cmp', '--compare', type=str, nargs='+', required=False, help='Other .db files to compare against --database, writes only the Comparison Report')
     parser.set_defaults(exclude_dt = False)
 
     # Parse the arguments
@@ -654,6 +1486,13 @@ def main():
     db_file = args.database
     output = args.outpath
     exclude_dt = args.nodirectorytree
+    treemap_top_k = args.treemaptopk
+    treemap_nodes = args.treemapnodes
+    compare_dbs = args.compare
+
+    if compare_dbs:
+        generate_comparison_report([db_file] + compare_dbs, output)
+        return
 
     # SQL Query
     dir_tree_df, details_df, ritm_num, files_df, folders_df, summary_df = sql_query(db_file)
@@ -671,25 +1510,7 @@ def main():
 
     date = dt.datetime.now().strftime('%Y%m%d-%H%M%S')
 
-    totalfiles = summary_df.loc[0, 'TotalFiles']
-    totalgbs = np.round(summary_df.loc[0, 'TotalSizeGB'], 4)
-
-    totals_tbl = go.Figure(data=[go.Table(
-        header=dict(values=['<b>Total Files</b>', '<b>Size (GB)</b>']),
-        cells = dict(  
-            values=[totalfiles, totalgbs], height=25
-            ))]
-        ).update_layout(
-            margin=dict(b=0, l=10, r=10,t=10), template='ggplot2',
-            width=300
-    ).to_html(
-            full_html=False,
-            include_plotlyjs='cdn',
-            config={
-                'displaylogo':False,
-                'modeBarButtonsToRemove': ['toImage', 'lasso2d']
-            }
-    )
+    totals_tbl = generate_totals_table(summary_df)
 
     output_ritm = os.path.join(output, 'Generic', 'Reports', f'{ritm_num}', f'{evidence_num}')
     os.makedirs(output_ritm, exist_ok=True)
@@ -711,7 +1532,7 @@ def main():
     if exclude_dt is False:
         print('\nGenerating Directory Tree')
         # Generate the HTML code
-        dirtree_html_output = generate_html_dirtree(paths, types, sizes_bytes, sizes_kb, sizes_mb, sizes_gb, details_df, totals_tbl)
+        dirtree_html_output = generate_html_dirtree(paths, types, sizes_bytes, sizes_kb, sizes_mb, sizes_gb, details_df, totals_tbl, treemap_top_k, treemap_nodes)
 
         print('Writing Directory Tree Report to HTML file.')
         # Save the HTML code to a file